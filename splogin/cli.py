@@ -1,36 +1,88 @@
 """Application context for splogin."""
 
+import functools
+import logging
 import os
 import re
 import sys
 
-from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from argparse import (
+    Action,
+    ArgumentParser,
+    Namespace,
+    RawTextHelpFormatter
+)
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 from .utils import get_logger, log_error, playwright_install
 from .utils.errors import (
     BrowserUnavailableError,
-    CredentialError,
     HomeAssistantApiError,
     SPLoginException
 )
 
-from .utils.credentials import CredentialManager
-from .spotify import SpotifyWebLogin
-from .home_assistant import HomeAssistant
+if TYPE_CHECKING:
+    from .home_assistant import HomeAssistant
+    from .spotify import SpotifyWebLogin
+    from .utils.credentials import CredentialManager
+
+# matches 'ENV_VAR=value' lines, skipping comments and malformed lines
+_ENV_LINE_PATTERN = re.compile(r"[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=(.*)")
+_EXPANSION_PATTERN = re.compile(r"\$\{([^}]+)\}")  # matches ${ENV_VAR}
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_SUBCOMMAND_HELP = {  # help of placeholders for subcommands not in argv
+    "init": "interactively add missing dependencies",
+    "run": "perform Spotify Web login and send data to Home Assistant",
+    "validate": "check if splogin is ready to run",
+    "hass": "manage Home Assistant instance",
+    "sp": "manage Spotify credentials",
+}
+
+
+class EnvVarHelpFormatter(RawTextHelpFormatter):
+    """Help formatter that lists env vars and defaults of options."""
+
+    ENV_VAR_HELP = "%s\n overwrites ${%s}\n"
+    ENV_VAR_DEFAULT_HELP = ENV_VAR_HELP + " default: %s"
+
+    def _get_help_string(self, action: Action) -> str | None:
+        """Append env var and default to the help of env var options."""
+        help_msg = super()._get_help_string(action)
+        if not hasattr(action, "env_var"):
+            return help_msg
+        if action.env_var_default is None:
+            return self.ENV_VAR_HELP % (help_msg or "", action.env_var)
+        return self.ENV_VAR_DEFAULT_HELP % (
+            help_msg or "",
+            action.env_var,
+            # argparse %-formats the returned help, so escape '%'
+            str(action.env_var_default).replace("%", "%%")
+        )
 
 
 class CommandLineInterface:
     """Command Line Interface with env var loader for splogin."""
 
-    def __init__(self):
-        """Initialize cli. Load environment and run command handler."""
+    __slots__ = (
+        "argv",
+        "argument_parser",
+        "env_var_prefix",
+        "env_file_flag",
+        "env_vars",
+        "subcommands",
+        "_builders",
+    )
+
+    def __init__(self, argv: list[str] | None = None):
+        """Initialize cli. Load environment and build the parser."""
+        self.argv = sys.argv[1:] if argv is None else argv
+
         # Create Argument Parser
         self.argument_parser = ArgumentParser(
             "splogin",
             description="Automated Spotify Web login and cookie extraction",
-            formatter_class=RawTextHelpFormatter
+            formatter_class=EnvVarHelpFormatter
         )
 
         # Load .env
@@ -38,34 +90,36 @@ class CommandLineInterface:
         self.env_file_flag = "--env-file"
         if (env_file := self.get_env_file()) is not None:
             self.load_env(env_file)
+        self.env_vars = {  # values of SPLOGIN_* vars keyed without prefix
+            env_var[len(self.env_var_prefix):]: value
+            for env_var, value in os.environ.items()
+            if env_var.startswith(self.env_var_prefix)
+        }
 
         # Initiate Subcommands
         self.subcommands = self.argument_parser.add_subparsers(
             description="these commands support all options listed above",
         )
 
-        self.add_init_command()
-        self.add_run_command()
-        self.add_validate_command()
-        self.add_credential_command(
-            "hass",
-            handler=HomeAssistant,
-            username_help="Complete URL for Home Assistant instance."
-        )
-        self.add_credential_command(
-            command="sp",
-            handler=SpotifyWebLogin,
-            username_help="Spotify Email or username"
-        )
+        # Only build the parsers of subcommands present in argv
+        self._builders: dict[str, Callable[[], None]] = {
+            "init": self.add_init_command,
+            "run": self.add_run_command,
+            "validate": self.add_validate_command,
+            "hass": self.add_hass_command,
+            "sp": self.add_sp_command,
+        }
+        for build_subcommand in self.get_subcommand_builders():
+            build_subcommand()
         self._add_common_options()
 
-        # Determine Command Handler and run it
-        args = self.argument_parser.parse_args()
-        run_command_handler: Callable[[Namespace], None] | None = getattr(
-            args, "func", None
-        )
+    def run(self) -> None:
+        """Parse arguments and run the selected command handler."""
+        args = self.argument_parser.parse_args(self.argv)
+        run_command_handler: Callable[[Namespace], None] | None = vars(
+            args
+        ).pop("func", None)
         if run_command_handler is not None:
-            delattr(args, "func")
             run_command_handler(args)
         else:
             self.argument_parser.print_help()
@@ -73,63 +127,61 @@ class CommandLineInterface:
     @classmethod
     def entrypoint(cls) -> None:
         """Run the application without returning an instance."""
-        cls()
+        cls().run()
 
     def get_env_file(self) -> Path | None:
         """Return the filepath for the --env-file argument."""
-        try:
-            return Path(sys.argv[sys.argv.index(self.env_file_flag) + 1])
-        except IndexError:
-            self.argument_parser.error(
-                f"argument {self.env_file_flag}: expected one argument"
-            )
-        except ValueError:
-            pass
+        if self.env_file_flag in self.argv:
+            flag_index = self.argv.index(self.env_file_flag)
+            if flag_index + 1 >= len(self.argv):
+                self.argument_parser.error(
+                    f"argument {self.env_file_flag}: expected one argument"
+                )
+            return Path(self.argv[flag_index + 1])
+
+        flag_with_value = self.env_file_flag + "="  # --env-file=<path>
+        for arg in self.argv:
+            if arg.startswith(flag_with_value):
+                return Path(arg[len(flag_with_value):])
         return None
 
+    def get_subcommand_builders(self) -> list[Callable[[], Any]]:
+        """Return builders for subcommands in argv or all builders."""
+        if not any(command in self.argv for command in self._builders):
+            return list(self._builders.values())
+        return [  # register other commands without arguments for help
+            builder if command in self.argv
+            else functools.partial(
+                self.subcommands.add_parser,
+                command,
+                help=_SUBCOMMAND_HELP[command]
+            )
+            for command, builder in self._builders.items()
+        ]
+
     def load_env(self, env_file: Path) -> None:
         """Load environment variables from given file."""
         try:
-            lines = (
-                line.strip() for line in
-                env_file.absolute().read_text().splitlines()
-                if line.strip() and not line.startswith("#")
-            )
-        except Exception as exc:  # pylint: disable=broad-exception-caught
+            with env_file.open(encoding="utf-8") as env_file_lines:
+                for line in env_file_lines:
+                    if assignment := _ENV_LINE_PATTERN.match(line):
+                        env_var, env_var_value = assignment.groups()
+                        os.environ[env_var] = _expand_env_vars(env_var_value)
+        except (OSError, UnicodeDecodeError) as exc:
             self.argument_parser.error(
                 f"argument {self.env_file_flag}: "
                 f"error loading '{env_file}': "
                 f"{exc}"
             )
-        expansion_pattern = r"(\${(.*?)})"  # matches ${ENV_VAR_TO_EXPAND}
-
-        for line in lines:
-            env_var, env_file_value = line.split("=", 1)
-            must_expand_query = re.search(expansion_pattern, env_file_value)
-
-            env_var_value = re.sub(
-                expansion_pattern,
-                os.getenv(
-                    must_expand_query.group(2),  # == 'ENV_VAR_TO_EXPAND'
-                    must_expand_query.group(1)  # == '${ENV_VAR_TO_EXPAND}'
-                ),
-                must_expand_query.string
-            ) if must_expand_query is not None else env_file_value
-
-            os.environ[env_var.strip()] = env_var_value.strip()
 
     def add_credential_command(
         self,
         command: str,
-        handler: CredentialManager,
+        handler: "CredentialManager",
         username_help: str,
     ):
         """Add a subcommand parser for managing credentials."""
         env_var_flag = f"--{handler.SECRET_TYPE}"
-        env_var = (
-            f"{handler.SERVICE_ALIAS.replace(' ', '_').upper()}"
-            f"_{handler.SECRET_TYPE.upper()}"
-        )
         sub_parser = self._add_subcommand(
             command,
             message=f"manage {handler.SERVICE_ALIAS} {handler.SECRET_ALIAS}",
@@ -146,7 +198,7 @@ class CommandLineInterface:
         )
 
         self._add_env_var_arg(
-            env_var,
+            handler.SECRET_ENV_VAR,
             env_var_flag,
             parser=sub_parser,
             dest="password",
@@ -160,6 +212,26 @@ class CommandLineInterface:
 
         self._add_common_options(handler.cli, sub_parser)
 
+    def add_hass_command(self) -> None:
+        """Add the parser for the 'hass' credential command."""
+        # pylint: disable-next=import-outside-toplevel
+        from .home_assistant import HomeAssistant
+        self.add_credential_command(
+            "hass",
+            handler=HomeAssistant,
+            username_help="Complete URL for Home Assistant instance."
+        )
+
+    def add_sp_command(self) -> None:
+        """Add the parser for the 'sp' credential command."""
+        # pylint: disable-next=import-outside-toplevel
+        from .spotify import SpotifyWebLogin
+        self.add_credential_command(
+            command="sp",
+            handler=SpotifyWebLogin,
+            username_help="Spotify Email or username"
+        )
+
     def add_init_command(self) -> None:
         """Add a command as an alias for 'validate --fix'."""
         def init_handler(args: Namespace) -> Callable[[Namespace], None]:
@@ -176,11 +248,12 @@ class CommandLineInterface:
 
     def add_run_command(self) -> None:
         """Add the parser for the 'run' command to the CLI."""
+        add_env_var_arg = self._add_env_var_arg
         sub_parser = self._add_subcommand(
             "run", "perform Spotify Web login and send data to Home Assistant",
             max_help_position=32
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "HOME_ASSISTANT_EVENT",
             "-e", "--event",
             parser=sub_parser,
@@ -188,7 +261,7 @@ class CommandLineInterface:
             metavar="<event>",
             default="new_spotcast_authentication"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "SPOTIFY_LOGIN_PAGE",
             "--spotify-login-page",
             parser=sub_parser,
@@ -196,7 +269,7 @@ class CommandLineInterface:
             metavar="<url>",
             default="https://accounts.spotify.com/login"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "SPOTIFY_LOGIN_BUTTON",
             "--spotify-login-button",
             parser=sub_parser,
@@ -204,7 +277,7 @@ class CommandLineInterface:
             metavar="<id>",
             default="login-button"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "SPOTIFY_LOGIN_USERNAME_FIELD",
             "--spotify-username-field",
             parser=sub_parser,
@@ -212,7 +285,7 @@ class CommandLineInterface:
             metavar="<id>",
             default="login-username"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "SPOTIFY_LOGIN_PASSWORD_FIELD",
             "--spotify-password-field",
             help="id of password field HTML element on --spotify-login-page",
@@ -225,6 +298,7 @@ class CommandLineInterface:
 
     def add_validate_command(self) -> None:
         """Add the parser for the 'validate' subcommand to the CLI."""
+        add_env_var_arg = self._add_env_var_arg
         sub_parser = self._add_subcommand(
             "validate", "check if splogin is ready to run",
             max_help_position=40
@@ -234,28 +308,28 @@ class CommandLineInterface:
             action="store_true",
             help="set this to be prompted to fix every validation warning"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "HOME_ASSISTANT_INSTANCE_URL",
             "--hass-instance-url",
             parser=sub_parser,
             help="Home Assistant instance url for non-interactive --fix",
             metavar="<url>"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "HOME_ASSISTANT_TOKEN",
             "--hass-token",
             parser=sub_parser,
             help="Home Assistant Instance url for non-interactive --fix",
             metavar="<token>"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "SPOTIFY_USER",
             "--spotify-user",
             parser=sub_parser,
             help="Spotify Email or username for non-interactive --fix",
             metavar="<user>"
         )
-        self._add_env_var_arg(
+        add_env_var_arg(
             "SPOTIFY_PASSWORD",
             "--spotify-password",
             parser=sub_parser,
@@ -277,9 +351,8 @@ class CommandLineInterface:
             description=message,
             help=message,
             epilog=epilog,
-            formatter_class=lambda prog: RawTextHelpFormatter(
-                prog,
-                max_help_position=max(24, max_help_position * 8 + 1),
+            formatter_class=_get_help_formatter(
+                max(24, max_help_position * 8 + 1)
             )
         )
 
@@ -308,11 +381,11 @@ class CommandLineInterface:
             "--log",
             parser=parser,
             help="set the logging level",
-            choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+            choices=_LOG_LEVELS,
             default="INFO",
             metavar="<level>",
             dest="log_level",
-            type=lambda val: val.upper()
+            type=str.upper
         )
 
     def _add_env_var_arg(
@@ -324,32 +397,36 @@ class CommandLineInterface:
     ) -> None:
         """Add an argument that can be set from environment."""
         default = add_argument_args.pop('default', None)
-        help_msg = "\n".join((
-            add_argument_args.pop("help", ""),
-            " overwrites ${" + self.env_var_prefix + env_var + "}",
-            f" default: {default}" if default is not None else "",
-        ))
-        (self.argument_parser if parser is None else parser).add_argument(
+        action = (
+            self.argument_parser if parser is None else parser
+        ).add_argument(
             *name_or_flags,
-            default=os.getenv(self.env_var_prefix + env_var, default),
-            help=help_msg,
+            default=self.env_vars.get(env_var, default),
             **add_argument_args
         )
+        # used by EnvVarHelpFormatter when the help is actually rendered
+        action.env_var = self.env_var_prefix + env_var
+        action.env_var_default = default
 
 
 def run(args: Namespace) -> None:
     """Entrypoint for subcommand 'splogin run'."""
+    # pylint: disable=import-outside-toplevel
+    from .home_assistant import HomeAssistant
+    from .spotify import SpotifyWebLogin
+
     log = get_logger("splogin", args.log_level)
-    log.debug(args)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("%s", args)
     log.info("Fetching Spotify credentials and Home Assistant instance")
     try:
         spotify_web_login = SpotifyWebLogin(log, args)
         log.info("Using Spotify user %s", spotify_web_login)
-        home_assistant = HomeAssistant(log)
-        log.info("Using Home Assistant %s", home_assistant)
-        spotify_login = spotify_web_login()
-        log.info("Sending cookie data to Home Assistant")
-        home_assistant.trigger_event(args.event, vars(spotify_login))
+        with HomeAssistant(log) as home_assistant:
+            log.info("Using Home Assistant %s", home_assistant)
+            spotify_login = spotify_web_login()
+            log.info("Sending cookie data to Home Assistant")
+            home_assistant.trigger_event(args.event, spotify_login._asdict())
     except SPLoginException as exc:
         log_error(log, exc)
     except Exception as exc:  # pylint: disable=broad-exception-caught
@@ -358,49 +435,97 @@ def run(args: Namespace) -> None:
 
 def validate(args: Namespace):
     """Entrypoint for subcommand 'splogin validate'."""
+    # pylint: disable=import-outside-toplevel
+    from .home_assistant import HomeAssistant
+    from .spotify import SpotifyWebLogin
+
     service_name = getattr(args, "service_name", "splogin-validate")
     log = get_logger(service_name, args.log_level)
-    log.debug(args)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("%s", args)
 
     log.info("Checking existence and validity of Home Assistant instance")
-    try:
-        hass = HomeAssistant(log)
-        log.info("Using Home Assistant instance: %s", hass)
-    except (CredentialError, HomeAssistantApiError) as exc:
-        if isinstance(exc, CredentialError) and args.fix:
-            log.warning("No instance found. Creating now...")
-            instance = getattr(args, "hass_instance_url", None)
-            if instance is None:
-                instance = HomeAssistant.get_username_input("Instance URL")
-            setattr(args, HomeAssistant.get_username_arg_name(), instance)
-            setattr(args, "password", getattr(args, "hass_token", None))
-            HomeAssistant.cli(args)
-        else:
-            log.warning(exc)
-
     log.info("Checking existence of credentials for Spotify Web login")
-    try:
-        spotify_login = SpotifyWebLogin(log)
-        log.info("Using Spotify User: %s", spotify_login)
-    except CredentialError:
-        if args.fix:
-            log.warning("No valid credentials found. Creating now...")
-            username = getattr(args, "spotify_user", None)
-            if username is None:
-                username = SpotifyWebLogin.get_username_input(
-                    "Spotify Email or username"
-                )
-            setattr(args, SpotifyWebLogin.get_username_arg_name(), username)
-            setattr(args, "password", getattr(args, "spotify_password", None))
-            SpotifyWebLogin.cli(args)
-        else:
-            log.warning("Spotify User Not Set")
-
     log.info("Checking Browser availability for Spotify Web Login")
-    try:
-        SpotifyWebLogin.validate_browser_availability()
+
+    # The checks are independent and blocking, so they run concurrently
+    hass, spotify_login, browser = _run_concurrently(
+        lambda: _load_credential_manager(HomeAssistant, log),
+        lambda: _load_credential_manager(SpotifyWebLogin, log),
+        SpotifyWebLogin.validate_browser_availability
+    )
+    if isinstance(hass, HomeAssistant):
+        hass.close()  # only its credentials are used below
+    for result in (hass, spotify_login, browser):
+        if isinstance(result, Exception) and not isinstance(
+            result, (HomeAssistantApiError, BrowserUnavailableError)
+        ):
+            raise result
+
+    _report_hass(hass, args, log)
+    _report_spotify_login(spotify_login, args, log)
+    _report_browser(browser, args, log)
+
+
+def _report_hass(
+    hass: "HomeAssistant | HomeAssistantApiError | None",
+    args: Namespace,
+    log: logging.Logger
+) -> None:
+    """Log the Home Assistant check and create an instance for --fix."""
+    # pylint: disable-next=import-outside-toplevel
+    from .home_assistant import HomeAssistant
+
+    if isinstance(hass, HomeAssistantApiError):
+        log.warning("%s", hass)
+    elif hass is not None:
+        log.info("Using Home Assistant instance: %s", hass)
+    elif args.fix:
+        log.warning("No instance found. Creating now...")
+        instance = getattr(args, "hass_instance_url", None)
+        if instance is None:
+            instance = HomeAssistant.get_username_input("Instance URL")
+        setattr(args, HomeAssistant.USER_ARG_NAME, instance)
+        setattr(args, "password", getattr(args, "hass_token", None))
+        HomeAssistant.cli(args)
+    else:
+        log.warning("No Home Assistant Instance configured")
+
+
+def _report_spotify_login(
+    spotify_login: "SpotifyWebLogin | None",
+    args: Namespace,
+    log: logging.Logger
+) -> None:
+    """Log the Spotify credential check and create them for --fix."""
+    # pylint: disable-next=import-outside-toplevel
+    from .spotify import SpotifyWebLogin
+
+    if spotify_login is not None:
+        log.info("Using Spotify User: %s", spotify_login)
+    elif args.fix:
+        log.warning("No valid credentials found. Creating now...")
+        username = getattr(args, "spotify_user", None)
+        if username is None:
+            username = SpotifyWebLogin.get_username_input(
+                "Spotify Email or username"
+            )
+        setattr(args, SpotifyWebLogin.USER_ARG_NAME, username)
+        setattr(args, "password", getattr(args, "spotify_password", None))
+        SpotifyWebLogin.cli(args)
+    else:
+        log.warning("Spotify User Not Set")
+
+
+def _report_browser(
+    browser: bool | BrowserUnavailableError,
+    args: Namespace,
+    log: logging.Logger
+) -> None:
+    """Log the browser check and install the browser for --fix."""
+    if not isinstance(browser, BrowserUnavailableError):
         log.info("Browser for playwright is installed")
-    except BrowserUnavailableError:
+    else:
         log.warning("Found no usable Browser for playwright")
         if args.fix:
             try:
@@ -409,5 +534,48 @@ def validate(args: Namespace):
                 log_error(log, exc, "Cannot install browser for playwright.")
 
 
+def _expand_env_vars(value: str) -> str:
+    """Return stripped value with ${ENV_VAR} replaced if it is set."""
+    if "${" in value:
+        value = _EXPANSION_PATTERN.sub(
+            lambda match: os.environ.get(match.group(1), match.group(0)),
+            value
+        )
+    return value.strip()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_help_formatter(
+    max_help_position: int
+) -> Callable[..., EnvVarHelpFormatter]:
+    """Return a shared help formatter factory for the given position."""
+    return functools.partial(
+        EnvVarHelpFormatter,
+        max_help_position=max_help_position
+    )
+
+
+def _load_credential_manager(
+    handler: type["CredentialManager"],
+    log: logging.Logger
+) -> "CredentialManager | None":
+    """Return a handler instance or None if it has no credentials."""
+    return handler(log) if handler.has_credentials() else None
+
+
+def _run_concurrently(*calls: Callable[[], Any]) -> list[Any]:
+    """Run blocking calls in threads, return results or exceptions."""
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    async def gather_calls() -> list[Any]:
+        """Await all calls in worker threads."""
+        return await asyncio.gather(
+            *(asyncio.to_thread(call) for call in calls),
+            return_exceptions=True
+        )
+
+    return asyncio.run(gather_calls())
+
+
 if __name__ == "__main__":
-    CommandLineInterface()
+    CommandLineInterface().run()
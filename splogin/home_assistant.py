@@ -1,9 +1,10 @@
 """Handler for Home Assistant API based on CredentialManager."""
 
-from logging import Logger
+from logging import DEBUG, Logger
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 
 from .utils.errors import HomeAssistantApiError
 
@@ -17,6 +18,8 @@ from .utils.credentials import (
 class HomeAssistant(CredentialManager):
     """Wrapper for authenticated Home Assistant API interactions."""
 
+    __slots__ = ("api_url", "base_headers", "session")
+
     SERVICE_NAME = "splogin-hass"
     SERVICE_ALIAS = "Home Assistant"
     SECRET_ALIAS = "instance"  # nosec
@@ -32,59 +35,93 @@ class HomeAssistant(CredentialManager):
                 "No Home Assistant Instance configured"
             ) from exc
         self.api_url = self.credentials.username + "/api/"
-        self.check_api_connection()
+        self.base_headers = {  # encoded once like http.client would
+            "Authorization": f"Bearer {self.credentials.password}".encode(
+                "latin-1"
+            )
+        }
+        self.session = requests.Session()  # reuse connection for all calls
+        self.session.headers.update(self.base_headers)
+        self.session.mount(
+            self.api_url,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=4,
+                max_retries=Retry(  # events are not idempotent, only GET
+                    total=3,
+                    connect=0,  # only 429/5xx responses are retried,
+                    read=0,  # failed or silent connections are not
+                    backoff_factor=0.3,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False,
+                    respect_retry_after_header=False
+                )
+            )
+        )
+        try:
+            self.check_api_connection()
+        except HomeAssistantApiError:
+            self.close()
+            raise
+
+    def __enter__(self) -> "HomeAssistant":
+        """Return handler to close its session when leaving context."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the API session."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the API session and its pooled connections."""
+        self.session.close()
 
     def check_api_connection(self) -> bool:
         """Return True after successful Home Assistant API call."""
         try:
-            response = requests.get(
-                self.api_url,
-                headers=self.base_headers,
-                timeout=10
-            )
-            self.log.debug(
-                "%d: headers=%r; content=%r",
-                response.status_code,
-                response.headers,
-                response.content
-            )
-            response.raise_for_status()
+            response = self.session.get(self.api_url, timeout=10)
         except requests.ConnectionError as exc:
             raise HomeAssistantApiError(
                 f"Home Assistant '{self.api_url}' is unreachable"
             ) from exc
         except requests.RequestException as exc:
             raise HomeAssistantApiError(
-                f"Home Assistant API returned {response.status_code}"
+                f"Home Assistant API request failed: {exc}"
             ) from exc
+        self._log_response(response)
+        if response.status_code >= 400:
+            raise HomeAssistantApiError(
+                f"Home Assistant API returned {response.status_code}"
+            )
+        return True
 
     def trigger_event(self, event: str, payload: dict[str, Any]):
         """Trigger a Home Assistant event with a json payload."""
+        self.log.debug("triggering event: %s. Payload %r", event, payload)
         try:
-            self.log.debug("triggering event: %s. Payload %r", event, payload)
-            response = requests.post(
+            response = self.session.post(
                 self.api_url + "events/" + event,
                 json=payload,
-                timeout=10,
-                headers={
-                    **self.base_headers,
-                    "Content-Type": "application/json"
-                }
+                timeout=10
+            )
+        except requests.RequestException as exc:
+            raise HomeAssistantApiError(
+                f"Home Assistant request failed when triggering {event}"
+            ) from exc
+        self._log_response(response)
+        if response.status_code >= 400:
+            raise HomeAssistantApiError(
+                f"Home Assistant returned {response.status_code} "
+                f"when triggering {event}"
             )
+
+    def _log_response(self, response: requests.Response) -> None:
+        """Debug log status, headers and content of an API response."""
+        if self.log.isEnabledFor(DEBUG):  # avoid reading content otherwise
             self.log.debug(
                 "%d: headers=%r; content=%r",
                 response.status_code,
                 response.headers,
                 response.content
             )
-            response.raise_for_status()
-        except requests.RequestException as exc:
-            raise HomeAssistantApiError(
-                f"Home Assistant returned {response.status_code}"
-                f"when triggering {event}"
-            ) from exc
-
-    @property
-    def base_headers(self) -> dict[str, Any]:
-        """Return headers dictionary with Authorization Header."""
-        return {"Authorization": "Bearer " + self.credentials.password}
@@ -1,11 +1,11 @@
 """Handler and entrypoint for automated Spotify Web login."""
 
+import re
+import time
+
 from argparse import Namespace
-from dataclasses import dataclass, fields
 from logging import Logger
-from typing import Any, Generator, TypeVar
-
-from playwright.sync_api import sync_playwright
+from typing import TYPE_CHECKING, Any, Generator, NamedTuple, TypeVar
 
 from splogin.utils.errors import SpotifyLoginError
 
@@ -13,11 +13,27 @@ from .utils.errors import BrowserUnavailableError, CredentialError
 
 from .utils.credentials import CredentialManager
 
-CookieValue = TypeVar("CookieValue", bool, float, str)
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, Page, Playwright
 
+CookieValue = TypeVar("CookieValue", bool, float, str)
 
-@dataclass(frozen=True, repr=True, )
-class SpotifyAuthCookie:
+# skip first-run pages, telemetry and safebrowsing to speed up startup
+_FIREFOX_USER_PREFS = {
+    "browser.startup.homepage_override.mstone": "ignore",
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+}
+# images, fonts and media are not needed to log in
+_BLOCKED_RESOURCE_PATTERN = re.compile(
+    r"\.(?:png|jpe?g|gif|webp|svg|ico|woff2?|ttf|otf|mp3|mp4|webm)(?:\?.*)?$",
+    re.IGNORECASE
+)
+
+
+class SpotifyAuthCookie(NamedTuple):
     """Container for Spotify cookie using its fields as cookie names."""
 
     sp_dc: str
@@ -26,25 +42,17 @@ class SpotifyAuthCookie:
     @classmethod
     def iter_cookie_names(cls) -> Generator[str, Any, None]:
         """Iterate over all cookies whose values must be extracted."""
-        for cookie in fields(cls):
-            yield cookie.name
+        yield from cls._fields
 
     @classmethod
     def from_playwright_cookies(cls, cookies: list[dict[str, CookieValue]]):
         """Extract values from playwright Spotify Login cookies."""
+        values = {cookie["name"]: cookie["value"] for cookie in cookies}
         return cls(**{
-            cookie_name: cls.get_cookie_value_by_name(cookie_name, cookies)
+            cookie_name: values[cookie_name]
             for cookie_name in cls.iter_cookie_names()
         })
 
-    @staticmethod
-    def get_cookie_value_by_name(
-        name: str,
-        cookies: list[dict[str, CookieValue]]
-    ) -> CookieValue:
-        """Return value for the cookie with the given name."""
-        return next(c["value"] for c in cookies if c["name"] == name)
-
 
 class SpotifyWebLogin(CredentialManager):
     """Handler for automated Spotify Web login and cookie extraction."""
@@ -55,6 +63,13 @@ class SpotifyWebLogin(CredentialManager):
     SECRET_TYPE = "password"  # nosec
     USER_ALIAS = "user"
 
+    _REQUIRED_CONF_FIELDS = (
+        "spotify_login_button",
+        "spotify_login_page",
+        "spotify_username_field",
+        "spotify_password_field",
+    )
+
     def __init__(
             self,
             logger: Logger,
@@ -69,14 +84,15 @@ class SpotifyWebLogin(CredentialManager):
         if sp_login_conf is None:
             return  # only manage credentials without a given login_conf
 
-        self.validate_browser_availability()
-
         try:
             self.spotify_login_button = sp_login_conf.spotify_login_button
             self.spotify_login_page = sp_login_conf.spotify_login_page
             self.spotify_username_field = sp_login_conf.spotify_username_field
             self.spotify_password_field = sp_login_conf.spotify_password_field
             self._validate_config()
+            self._username_selector = "input#" + self.spotify_username_field
+            self._password_selector = "input#" + self.spotify_password_field
+            self._login_selector = "button#" + self.spotify_login_button
         except AttributeError as exc:
             raise SpotifyLoginError(
                 "Invalid config for Spotify Login"
@@ -84,10 +100,16 @@ class SpotifyWebLogin(CredentialManager):
 
     def __call__(self) -> SpotifyAuthCookie:
         """Login to Spotify Web and return sp_dc and sp_key cookies."""
+        # pylint: disable-next=import-outside-toplevel
+        from playwright.sync_api import sync_playwright
         try:
             with sync_playwright() as playwright:
-                browser = playwright.firefox.launch()
+                browser = self._launch_browser(playwright)
                 context = browser.new_context()
+                context.route(
+                    _BLOCKED_RESOURCE_PATTERN,
+                    lambda route: route.abort()
+                )
                 page = context.new_page()
                 page.goto(self.spotify_login_page)
 
@@ -95,42 +117,69 @@ class SpotifyWebLogin(CredentialManager):
                     "filling credentials for %s",
                     self.credentials.username
                 )
-                page.fill(
-                    "input#" + self.spotify_username_field,
+                page.locator(self._username_selector).fill(
                     self.credentials.username
                 )
-                page.fill(
-                    "input#" + self.spotify_password_field,
+                page.locator(self._password_selector).fill(
                     self.credentials.password
                 )
 
                 self.log.debug("submitting login...")
-                page.click("button#" + self.spotify_login_button)
-                page.wait_for_load_state("networkidle")
+                page.locator(self._login_selector).click()
+                if not self._wait_for_auth_cookies(page):
+                    self.log.debug("no auth cookies yet, waiting idle")
+                    page.wait_for_load_state("networkidle")
 
                 self.log.debug("extracting cookies")
-                cookies = context.cookies()
+                cookies = context.cookies([self.spotify_login_page])
                 return SpotifyAuthCookie.from_playwright_cookies(cookies)
+        except BrowserUnavailableError:
+            raise
         except Exception as exc:
             raise SpotifyLoginError(
                 f"Unable to log into spotify as {self}"
             ) from exc
 
+    def _wait_for_auth_cookies(
+        self,
+        page: "Page",
+        timeout: float = 15
+    ) -> bool:
+        """Return True once auth cookies are set, False on timeout."""
+        required = set(SpotifyAuthCookie.iter_cookie_names())
+        deadline = time.monotonic() + timeout
+        while True:
+            cookies = page.context.cookies([self.spotify_login_page])
+            if required <= {cookie["name"] for cookie in cookies}:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            page.wait_for_timeout(250)  # keeps playwright events running
+
     def _validate_config(self) -> None:
         """Raise AttributeError for a missing config value."""
-        for attribute, value in vars(self).items():
-            if attribute.startswith("spotify_") and value is None:
+        for attribute in self._REQUIRED_CONF_FIELDS:
+            if getattr(self, attribute) is None:
                 raise AttributeError(f"sp_login_conf is missing '{attribute}'")
 
-    @staticmethod
-    def validate_browser_availability() -> None:
+    @classmethod
+    def validate_browser_availability(cls) -> None:
         """Raise BrowserUnavailableError if playwright launch fails."""
+        # pylint: disable-next=import-outside-toplevel
+        from playwright.sync_api import sync_playwright
         with sync_playwright() as playwright:
-            try:
-                browser = playwright.firefox.launch()
-                browser.close()
-                return True
-            except Exception as exc:  # pylint: disable=broad-exception-caught
-                raise BrowserUnavailableError(
-                    "Error during playwright browser launch"
-                ) from exc
+            cls._launch_browser(playwright).close()
+            return True
+
+    @staticmethod
+    def _launch_browser(playwright: "Playwright") -> "Browser":
+        """Return launched browser or raise BrowserUnavailableError."""
+        try:
+            return playwright.firefox.launch(
+                headless=True,
+                firefox_user_prefs=_FIREFOX_USER_PREFS
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            raise BrowserUnavailableError(
+                "Error during playwright browser launch"
+            ) from exc
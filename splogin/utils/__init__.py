@@ -2,20 +2,25 @@
 
 import logging
 import subprocess  # nosec
-import sys
 
 from .errors import BrowserUnavailableError
 
+_LOG_FORMATTER = logging.Formatter("%(name)s %(levelname)8s - %(message)s")
+
 
 def get_logger(name: str, level: int | str) -> logging.Logger:
     """Create a named, formatted logger for the given level."""
     logger = logging.getLogger(name)
-    logger.setLevel(level)
-    formatter = logging.Formatter(
-        "%(name)s %(levelname)8s - %(message)s"
-    )
+    if isinstance(level, str):
+        level = logging.getLevelName(level)
+    if logger.level != level:
+        logger.setLevel(level)  # clears the level cache of all loggers
+    logger.propagate = False
+    if any(h.formatter is _LOG_FORMATTER for h in logger.handlers):
+        return logger
+
     stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
+    stream_handler.setFormatter(_LOG_FORMATTER)
     logger.addHandler(stream_handler)
     return logger
 
@@ -26,15 +31,25 @@ def log_error(
     message: str | None = None,
 ) -> None:
     """Error log the (exception) message. Debug log the traceback."""
-    log.error(exc if message is None else message)
-    log.debug(exc.__class__, exc_info=True)
+    log.error("%s", exc if message is None else message)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("%s", exc.__class__, exc_info=exc)
 
 
 def playwright_install(browser: str = "firefox") -> None:
-    """Install browser using playwright cli in the python directory."""
+    """Install browser by running the playwright driver cli directly."""
+    # pylint: disable-next=import-outside-toplevel
+    from playwright._impl._driver import (
+        compute_driver_executable,
+        get_driver_env
+    )
+    driver = compute_driver_executable()  # (node, cli.js) since 1.39
+    if not isinstance(driver, tuple):
+        driver = (driver,)
     try:
         subprocess.run(  # nosec
-            (sys.executable, "-m", "playwright", "install", browser),
+            (*driver, "install", browser),
+            env=get_driver_env(),
             check=True
         )
     except subprocess.CalledProcessError as exc:
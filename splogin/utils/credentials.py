@@ -1,24 +1,65 @@
 """Credential Manager with cli entrypoint."""
 
-import argparse
-import getpass
+import functools
 import logging
+import threading
+import time
 
-import keyring
-from keyring.errors import KeyringError, PasswordDeleteError
+from typing import TYPE_CHECKING
 
 from . import get_logger, log_error
 from .errors import CredentialError, SPLoginException
 
+if TYPE_CHECKING:
+    import argparse
+
+    from keyring.backend import KeyringBackend
+    from keyring.credentials import Credential
+
+# serializes backend access, validate loads credentials in threads and
+# backends may prompt to unlock the keyring on each call
+_KEYRING_LOCK = threading.Lock()
+
 
 class CredentialManager:
     """Wrapper for keyring to manage a single piece of credentials."""
 
-    SERVICE_NAME: str | None
-    SERVICE_ALIAS: str | None
-    SECRET_ALIAS: str | None
-    SECRET_TYPE: str | None
-    USER_ALIAS: str | None
+    __slots__ = ("log", "credentials")
+
+    SERVICE_NAME: str | None = None
+    SERVICE_ALIAS: str | None = None
+    SECRET_ALIAS: str | None = None
+    SECRET_TYPE: str | None = None
+    USER_ALIAS: str | None = None
+    USER_ARG_NAME: str | None = None  # derived from USER_ALIAS
+    SECRET_ENV_VAR: str | None = None  # from SERVICE_ALIAS, SECRET_TYPE
+    SECRET_ALIAS_CAP: str | None = None  # derived from SECRET_ALIAS
+    SECRET_TYPE_CAP: str | None = None  # derived from SECRET_TYPE
+
+    CREDENTIAL_CACHE_TTL = 30  # seconds
+    _credential_cache: dict[
+        tuple[str, str | None],
+        tuple[float, "Credential | None"]
+    ] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Derive cli names and prompt labels from the subclass."""
+        super().__init_subclass__(**kwargs)
+        user_alias = getattr(cls, "USER_ALIAS", None)
+        if user_alias is not None:
+            cls.USER_ARG_NAME = user_alias.replace("-", "_")
+        service_alias = getattr(cls, "SERVICE_ALIAS", None)
+        secret_type = getattr(cls, "SECRET_TYPE", None)
+        if service_alias is not None and secret_type is not None:
+            cls.SECRET_ENV_VAR = (
+                f"{service_alias.replace(' ', '_').upper()}"
+                f"_{secret_type.upper()}"
+            )
+        if secret_type is not None:
+            cls.SECRET_TYPE_CAP = secret_type.capitalize()
+        secret_alias = getattr(cls, "SECRET_ALIAS", None)
+        if secret_alias is not None:
+            cls.SECRET_ALIAS_CAP = secret_alias.capitalize()
 
     def __init__(
         self,
@@ -27,7 +68,7 @@ class CredentialManager:
         """Load credentials for cls.SERVICE_NAME."""
         self._raise_for_missing_service_name()
         self.log = logger
-        credentials = keyring.get_credential(self.SERVICE_NAME, None)
+        credentials = self._get_credential()
         if credentials is None:
             raise CredentialError(f"{self.SERVICE_NAME}: no credentials")
         if credentials.password is None:
@@ -42,7 +83,13 @@ class CredentialManager:
 
     def delete(self) -> str:
         """Delete the existing credentials and return username."""
-        keyring.delete_password(self.SERVICE_NAME, self.credentials.username)
+        keyring = _get_keyring()
+        with _KEYRING_LOCK:
+            keyring.delete_password(
+                self.SERVICE_NAME,
+                self.credentials.username
+            )
+        self._clear_credential_cache()
         return self.credentials.username
 
     @classmethod
@@ -53,26 +100,37 @@ class CredentialManager:
         password: str | None = None,
     ) -> tuple['CredentialManager', str]:
         """Create new credentials after removing existing ones."""
-        try:
+        keyring = _get_keyring()  # backend shares the module's api
+        operation = "Created"
+        if (existing := cls._get_credential()) is not None:
             operation = "Updated"
-            keyring.delete_password(cls.SERVICE_NAME, username)
-            log.debug("deleted existing %s: %s", cls.SERVICE_NAME, username)
-        except PasswordDeleteError:
-            operation = "Created"
+            with _KEYRING_LOCK:
+                keyring.delete_password(cls.SERVICE_NAME, existing.username)
+            log.debug(
+                "deleted existing %s: %s",
+                cls.SERVICE_NAME,
+                existing.username
+            )
         if password is None:
+            import getpass  # pylint: disable=import-outside-toplevel
             password = getpass.getpass(
-                f"Enter {cls.SECRET_TYPE.capitalize()}: "
+                f"Enter {cls.SECRET_TYPE_CAP}: "
             ).strip()
-        keyring.set_password(cls.SERVICE_NAME, username, password)
+        with _KEYRING_LOCK:
+            keyring.set_password(cls.SERVICE_NAME, username, password)
+        cls._clear_credential_cache()
         return cls(log), operation
 
     @classmethod
-    def cli(cls, args: argparse.Namespace) -> None:
+    def cli(cls, args: "argparse.Namespace") -> None:
         """Entrypoint for splogin credential management subcommands."""
+        # pylint: disable-next=import-outside-toplevel
+        from keyring.errors import KeyringError
         log = get_logger(cls.SERVICE_NAME, args.log_level)
-        log.debug(args)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("%s", args)
         try:
-            username = getattr(args, cls.get_username_arg_name())
+            username = getattr(args, cls.USER_ARG_NAME)
             if username == "rm":
                 credentials = cls(log)
                 credentials.delete()
@@ -96,18 +154,43 @@ class CredentialManager:
         ) as exc:
             log_error(log, exc)
 
+    @classmethod
+    def has_credentials(cls) -> bool:
+        """Return True if credentials for the service are stored."""
+        cls._raise_for_missing_service_name()
+        credentials = cls._get_credential()
+        return credentials is not None and credentials.password is not None
+
     @classmethod
     def get_username_input(cls, prompt: str | None = None) -> str:
         """Prompt for user input and return stripped text."""
-        # pylint: disable=consider-using-f-string
-        return input("Enter {}: ".format(
-            prompt if prompt is not None else cls.SECRET_ALIAS.capitalize()
-        )).strip()
+        if prompt is None:
+            prompt = cls.SECRET_ALIAS_CAP
+        return input(f"Enter {prompt}: ").strip()
+
+    @classmethod
+    def _get_credential(
+        cls,
+        username: str | None = None
+    ) -> "Credential | None":
+        """Return keyring credentials, cached for a short time."""
+        key = (cls.SERVICE_NAME, username)
+        cached = cls._credential_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < cls.CREDENTIAL_CACHE_TTL:
+            return cached[1]
+        keyring = _get_keyring()
+        with _KEYRING_LOCK:
+            credentials = keyring.get_credential(cls.SERVICE_NAME, username)
+        cls._credential_cache[key] = (now, credentials)
+        return credentials
 
     @classmethod
-    def get_username_arg_name(cls) -> str:
-        """Replace '-' with '_' for accessing username arg in cli ."""
-        return cls.USER_ALIAS.replace("-", "_")
+    def _clear_credential_cache(cls) -> None:
+        """Drop all cached credentials for cls.SERVICE_NAME."""
+        for key in list(cls._credential_cache):
+            if key[0] == cls.SERVICE_NAME:
+                del cls._credential_cache[key]
 
     @classmethod
     def _raise_for_missing_service_name(cls) -> None:
@@ -117,3 +200,11 @@ class CredentialManager:
                 "CredentialManager must be used from subclass "
                 "with a defined cls.SERVICE_NAME"
             )
+
+
+@functools.cache
+def _get_keyring() -> "KeyringBackend":
+    """Import keyring and return its backend, resolved once."""
+    with _KEYRING_LOCK:  # parallel cache misses must not init twice
+        import keyring  # pylint: disable=import-outside-toplevel
+        return keyring.get_keyring()